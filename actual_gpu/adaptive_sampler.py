@@ -0,0 +1,61 @@
+from datetime import datetime
+
+# CONFIGURATION
+POLL_INTERVAL = 1  # seconds, NVML reads are cheap and timestamps have 1 s resolution, so poll at that rate
+MAX_GAP = 60  # seconds, heartbeat: persist at least this often even if nothing changed
+
+# A sample is only persisted when a metric moves by more than its deadband
+DEADBANDS = {
+    "gpu_utilization": 5,  # %
+    "memory_used_MB": 64,  # MB
+    "temperature_C": 1,  # °C
+    "power_usage_W": 10.0,  # W
+    "fan_speed_percent": 5,  # %
+}
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class AdaptiveSampler:
+    """
+    Decides which polled samples are worth storing. The collector polls every `interval`
+    seconds, so short spikes are seen; storage is kept sparse by the deadbands and the
+    `max_gap` heartbeat, not by polling less often.
+
+    A stored value holds until the next stored row of the same GPU, so rollups should weight
+    each row by the time to that next row (e.g. LEAD(timestamp) in SQL), never by the gap
+    since the previous one. Every stored entry also gets a "sample_interval_s" field: the
+    polling interval, which is the span to assume for the last (still open) row of a GPU.
+    """
+
+    def __init__(self, deadbands=None, poll_interval=POLL_INTERVAL, max_gap=MAX_GAP):
+        self.deadbands = DEADBANDS if deadbands is None else deadbands
+        self.max_gap = max_gap
+        self.interval = poll_interval  # seconds between polls
+        self._last_saved = {}  # gpu_index -> (time, entry) of the last stored sample
+
+    def _changed(self, old, new):
+        for key, band in self.deadbands.items():
+            if abs(new[key] - old[key]) > band:
+                return True
+        old_pids = {p["pid"] for p in old.get("processes", [])}
+        new_pids = {p["pid"] for p in new.get("processes", [])}
+        return old_pids != new_pids
+
+    def filter(self, stats):
+        """Return the entries of one poll that should be stored."""
+        to_save = []
+        for entry in stats:
+            gpu_id = entry["gpu_index"]
+            now = datetime.strptime(entry["timestamp"], TIME_FORMAT)
+
+            saved = self._last_saved.get(gpu_id)
+            if saved is not None:
+                gap = (now - saved[0]).total_seconds()
+                if gap < self.max_gap and not self._changed(saved[1], entry):
+                    continue
+
+            self._last_saved[gpu_id] = (now, entry)
+            entry["sample_interval_s"] = float(self.interval)
+            to_save.append(entry)
+        return to_save
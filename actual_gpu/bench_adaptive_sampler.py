@@ -0,0 +1,112 @@
+import os
+import json
+import random
+from datetime import datetime, timedelta
+from adaptive_sampler import AdaptiveSampler, TIME_FORMAT
+
+# Benchmark: rows stored by adaptive sampling (1 s polls, deadbands, heartbeat) compared to
+# the old collector, which stored every poll at a fixed 5 s interval
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DCGM_METRICS = os.path.join(BASE_DIR, "..", "dcgm", "GPU_metrics.txt")
+TESTS_DIR = os.path.join(BASE_DIR, "tests")
+FIXED_INTERVAL = 5  # seconds, the old collector's polling interval
+IDLE_SECONDS = 60 * 60  # length of the synthetic idle trace
+NUMERIC = ["gpu_utilization", "memory_used_MB", "memory_total_MB",
+           "temperature_C", "power_usage_W", "fan_speed_percent"]
+
+
+def load_dcgm_idle_trace(path=DCGM_METRICS, seconds=IDLE_SECONDS, seed=0):
+    # `dcgmi dmon -e 150,155,203,252` output: TMPTR, POWER, GPUTL, FBUSD, one row per second.
+    # The file only holds 10 s of an idle RTX 3050, so stretch it to an hour by drawing each
+    # second from those readings, with the temperature drifting by a degree now and then.
+    readings = []
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 6 and parts[0] == "GPU":
+                readings.append((int(parts[2]), float(parts[3]), int(parts[4]), int(parts[5])))
+
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    drift = 0
+    entries = []
+    for second in range(seconds):
+        if rng.random() < 0.01:
+            drift = max(-1, min(1, drift + rng.choice((-1, 1))))
+        temp, power, util, mem = rng.choice(readings)
+        entries.append({
+            "gpu_index": 0,
+            "timestamp": (start + timedelta(seconds=second)).strftime(TIME_FORMAT),
+            "gpu_utilization": util,
+            "memory_used_MB": mem,
+            "memory_total_MB": 4096,
+            "temperature_C": temp + drift,
+            "power_usage_W": power,
+            "fan_speed_percent": 0,
+            "processes": [],
+        })
+    return entries
+
+
+def load_json_trace(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def resample(entries, interval):
+    """
+    Simulate polling a recorded trace every `interval` seconds: numeric metrics are linearly
+    interpolated between the recorded samples (a pessimistic choice for storage, as every
+    ramp becomes a run of changed samples), processes come from the last recorded sample.
+    """
+    by_gpu = {}
+    for entry in entries:
+        by_gpu.setdefault(entry["gpu_index"], []).append(
+            (datetime.strptime(entry["timestamp"], TIME_FORMAT), entry))
+
+    polls = {}
+    for samples in by_gpu.values():
+        samples.sort(key=lambda s: s[0])
+        t = samples[0][0]
+        i = 0
+        while t <= samples[-1][0]:
+            while i + 1 < len(samples) and samples[i + 1][0] <= t:
+                i += 1
+            (t0, a), (t1, b) = samples[i], samples[min(i + 1, len(samples) - 1)]
+            f = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+            entry = dict(a, timestamp=t.strftime(TIME_FORMAT))
+            for key in NUMERIC:
+                value = a[key] + (b[key] - a[key]) * f
+                entry[key] = value if isinstance(a[key], float) else round(value)
+            polls.setdefault(t, []).append(entry)
+            t += timedelta(seconds=interval)
+    return [polls[t] for t in sorted(polls)]
+
+
+def run(polls):
+    # Feed the trace one poll at a time, as the collector would
+    sampler = AdaptiveSampler()
+    return sum(len(sampler.filter([dict(e) for e in poll])) for poll in polls)
+
+
+if __name__ == "__main__":
+    traces = [("dcgm idle, 1 h (synthetic)", load_dcgm_idle_trace())]
+    for name in sorted(os.listdir(TESTS_DIR), key=lambda n: int(n[1:])):
+        path = os.path.join(TESTS_DIR, name, "gpu_log.json")
+        if os.path.exists(path):
+            traces.append((f"tests/{name}/gpu_log.json", load_json_trace(path)))
+
+    interval = AdaptiveSampler().interval
+    print(f"Polling every {interval} s; 'Fixed' is every poll stored at {FIXED_INTERVAL} s, as before.")
+    print(f"{'Trace':<30}{'Polls':>7}{'Fixed':>7}{'Stored':>8}{'vs polls':>10}{'vs fixed':>10}")
+    total = [0, 0, 0]
+    for name, entries in traces:
+        polls = resample(entries, interval)
+        num_polls = sum(len(poll) for poll in polls)
+        fixed = sum(len(poll) for poll in resample(entries, FIXED_INTERVAL))
+        stored = run(polls)
+        for i, n in enumerate((num_polls, fixed, stored)):
+            total[i] += n
+        print(f"{name:<30}{num_polls:>7}{fixed:>7}{stored:>8}{1 - stored / num_polls:>10.0%}{1 - stored / fixed:>10.0%}")
+    num_polls, fixed, stored = total
+    print(f"{'Total':<30}{num_polls:>7}{fixed:>7}{stored:>8}{1 - stored / num_polls:>10.0%}{1 - stored / fixed:>10.0%}")
@@ -0,0 +1,79 @@
+import time
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+from gpu_history import GPUHistory, TIME_FORMAT
+
+# Benchmark: memory for one GPU-hour at 1 s, compressed history vs. the old lists of Python objects
+SAMPLES = 3600
+
+
+def generate_hour(seed=0):
+    # Random walk around a busy GPU, similar to the recorded tests/tN traces
+    rng = random.Random(seed)
+    start = datetime(2025, 7, 21, 15, 0, 0)
+    util, mem, temp, power = 90, 1059, 72, 207.495
+    entries = []
+    for i in range(SAMPLES):
+        util = max(0, min(100, util + rng.randint(-3, 3)))
+        mem = max(0, mem + rng.choice([0, 0, 0, 2, -2, 40, -40]))
+        temp = max(30, min(90, temp + rng.choice([0, 0, 0, 1, -1])))
+        power = max(10.0, round(power + rng.randint(-5000, 5000) / 1000, 3))
+        entries.append({
+            "gpu_index": 0,
+            "timestamp": (start + timedelta(seconds=i)).strftime(TIME_FORMAT),
+            "gpu_utilization": util,
+            "memory_used_MB": mem,
+            "memory_total_MB": 8192,
+            "temperature_C": temp,
+            "power_usage_W": power,
+            "fan_speed_percent": 40,
+            "processes": [],
+        })
+    return entries
+
+
+def build_lists(entries):
+    # What gpu_log.py used to keep per GPU, extended with the same metrics as the history
+    data = {"time": [], "temp": [], "util": [], "mem": [], "power": [], "fan": []}
+    for entry in entries:
+        data["time"].append(datetime.strptime(entry["timestamp"], TIME_FORMAT))
+        data["temp"].append(entry["temperature_C"])
+        data["util"].append(entry["gpu_utilization"])
+        data["mem"].append(entry["memory_used_MB"])
+        data["power"].append(entry["power_usage_W"])
+        data["fan"].append(entry["fan_speed_percent"])
+    return data
+
+
+def build_history(entries):
+    history = GPUHistory()
+    for entry in entries:
+        history.append(entry)
+    return history
+
+
+def measure(build, entries):
+    tracemalloc.start()
+    result = build(entries)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+if __name__ == "__main__":
+    entries = generate_hour()
+    datetime.strptime(entries[0]["timestamp"], TIME_FORMAT)  # keep strptime's import out of the measurement
+
+    _, list_bytes = measure(build_lists, entries)
+    history, history_bytes = measure(build_history, entries)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        data = history.range(0)
+    decode_ms = (time.perf_counter() - start) * 1000 / 100
+
+    print(f"Lists of Python objects: {list_bytes / 1024:8.1f} KiB per GPU-hour")
+    print(f"Compressed history:      {history_bytes / 1024:8.1f} KiB per GPU-hour "
+          f"({history.nbytes() / 1024:.1f} KiB encoded, {history_bytes / list_bytes:.1%} of lists)")
+    print(f"Decode full hour to NumPy: {decode_ms:.2f} ms ({len(data['time'])} samples)")
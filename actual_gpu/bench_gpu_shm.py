@@ -0,0 +1,61 @@
+import time
+import timeit
+import multiprocessing
+from gpu_shm import LatestStatePublisher, LatestStateReader
+
+# Benchmark: read latency of the shared latest-state block while a writer keeps publishing
+BENCH_SHM_NAME = "ca_gpu_latest_bench"
+NUM_GPUS = 8
+READS = 200_000
+PUBLISH_INTERVAL = 0.001  # seconds, far more often than the collector's 1-5 s
+
+
+def make_stats(i):
+    return [{
+        "gpu_index": gpu,
+        "timestamp": "2025-07-21 15:47:12",
+        "gpu_utilization": (i + gpu) % 100,
+        "memory_used_MB": 1000 + i % 50,
+        "memory_total_MB": 8192,
+        "temperature_C": 60 + i % 20,
+        "power_usage_W": 200.5,
+        "fan_speed_percent": 40,
+        "processes": [],
+    } for gpu in range(NUM_GPUS)]
+
+
+def writer(ready, stop):
+    publisher = LatestStatePublisher(BENCH_SHM_NAME)
+    polls = [make_stats(i) for i in range(100)]
+    ready.set()
+    i = 0
+    while not stop.is_set():
+        publisher.publish(polls[i % 100])
+        i += 1
+        time.sleep(PUBLISH_INTERVAL)
+    publisher.close()
+
+
+if __name__ == "__main__":
+    ready, stop = multiprocessing.Event(), multiprocessing.Event()
+    proc = multiprocessing.Process(target=writer, args=(ready, stop))
+    proc.start()
+    ready.wait()
+
+    reader = LatestStateReader(BENCH_SHM_NAME)
+    records = reader.records
+    for label, fn in [
+        ("single field from zero-copy view", lambda: records["temperature_C"][0]),
+        ("version counter", reader.version),
+        ("consistent snapshot, all GPUs", reader.read),
+    ]:
+        seconds = min(timeit.repeat(fn, number=READS, repeat=3))
+        print(f"{label:<34}{seconds / READS * 1e9:8.0f} ns/read")
+
+    start = reader.version()
+    time.sleep(0.5)
+    print(f"Writer published {(reader.version() - start) // 2 / 0.5:.0f} polls/s of {NUM_GPUS} GPUs meanwhile")
+
+    reader.close()
+    stop.set()
+    proc.join()
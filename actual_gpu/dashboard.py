@@ -88,25 +88,26 @@ def update_graphs(_, selected_gpu):
 
     df = df[df["gpu_index"] == selected_gpu]
     df["timestamp"] = pd.to_datetime(df["timestamp"])
+    # With adaptive sampling a value holds until the next stored row, so draw steps
 
     # Temperature
-    temp_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["temperature_C"], mode="lines+markers"))
+    temp_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["temperature_C"], mode="lines+markers", line_shape="hv"))
     temp_fig.update_layout(title="Temperature (°C)", xaxis_title="Time", yaxis_title="Temp")
 
     # Utilization
-    util_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["gpu_utilization"], mode="lines+markers"))
+    util_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["gpu_utilization"], mode="lines+markers", line_shape="hv"))
     util_fig.update_layout(title="GPU Utilization (%)", xaxis_title="Time", yaxis_title="Utilization")
 
     # Memory
-    mem_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["memory_used_MB"], mode="lines+markers"))
+    mem_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["memory_used_MB"], mode="lines+markers", line_shape="hv"))
     mem_fig.update_layout(title="Memory Usage (MB)", xaxis_title="Time", yaxis_title="Memory Used")
 
     # Power
-    power_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["power_usage_W"], mode="lines+markers"))
+    power_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["power_usage_W"], mode="lines+markers", line_shape="hv"))
     power_fig.update_layout(title="Power Usage (W)", xaxis_title="Time", yaxis_title="Power (W)")
 
     # Fan Speed
-    fan_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["fan_speed_percent"], mode="lines+markers"))
+    fan_fig = go.Figure(go.Scatter(x=df["timestamp"], y=df["fan_speed_percent"], mode="lines+markers", line_shape="hv"))
     fan_fig.update_layout(title="Fan Speed (%)", xaxis_title="Time", yaxis_title="Fan Speed")
 
     # Process Table
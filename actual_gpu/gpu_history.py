@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+import numpy as np
+
+# CONFIGURATION
+CHUNK_SIZE = 600  # samples per compressed chunk (10 minutes at 1 s)
+RETENTION = 6 * 3600  # seconds of history kept per GPU
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+EPOCH = datetime(1970, 1, 1)
+
+# Metrics kept in the history, with the factor used to store them as integers.
+# Power comes from NVML in milliwatts, so milliwatt resolution is lossless for real GPUs.
+METRICS = {
+    "temperature_C": 1,
+    "gpu_utilization": 1,
+    "memory_used_MB": 1,
+    "power_usage_W": 1000,
+    "fan_speed_percent": 1,
+}
+
+
+def _put_varint(buf, n):
+    # Zigzag so small negative deltas stay small, then LEB128
+    n = (n << 1) if n >= 0 else ((-n) << 1) - 1
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _decode_varints(buf):
+    # Vectorised LEB128 + zigzag decode of a whole stream
+    b = np.frombuffer(buf, dtype=np.uint8)
+    if len(b) == 0:
+        return np.empty(0, dtype=np.int64)
+    ends = np.flatnonzero(b < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    owner = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shift = ((np.arange(len(b)) - starts[owner]) * 7).astype(np.uint64)
+    zigzag = np.bitwise_or.reduceat((b & 0x7F).astype(np.uint64) << shift, starts)
+    return (zigzag >> np.uint64(1)).astype(np.int64) ^ -(zigzag & np.uint64(1)).astype(np.int64)
+
+
+class _Chunk:
+    """
+    Up to CHUNK_SIZE samples of one GPU. Timestamps are stored as delta-of-delta,
+    metrics as deltas, each column in its own varint byte stream.
+    """
+
+    __slots__ = ("start", "end", "count", "times", "columns", "_prev_delta", "_prev_values")
+
+    def __init__(self, t):
+        self.start = t
+        self.end = t
+        self.count = 0
+        self.times = bytearray()
+        self.columns = {key: bytearray() for key in METRICS}
+        self._prev_delta = 0
+        self._prev_values = dict.fromkeys(METRICS, 0)
+
+    def append(self, t, values):
+        if self.count:
+            delta = t - self.end
+            _put_varint(self.times, delta - self._prev_delta)
+            self._prev_delta = delta
+        self.end = t
+        for key, value in values.items():
+            _put_varint(self.columns[key], value - self._prev_values[key])
+            self._prev_values[key] = value
+        self.count += 1
+
+    def seal(self):
+        # Closed chunks never grow again: drop the encoder state and bytearray slack
+        self.times = bytes(self.times)
+        self.columns = {key: bytes(buf) for key, buf in self.columns.items()}
+        self._prev_values = None
+
+    def decode(self):
+        deltas = np.cumsum(_decode_varints(self.times))
+        times = np.empty(self.count, dtype=np.int64)
+        times[0] = self.start
+        times[1:] = self.start + np.cumsum(deltas)
+        data = {"time": times}
+        for key, buf in self.columns.items():
+            data[key] = np.cumsum(_decode_varints(buf))
+        return data
+
+    def nbytes(self):
+        return len(self.times) + sum(len(buf) for buf in self.columns.values())
+
+
+class GPUHistory:
+    """
+    Compressed in-memory history of per-GPU samples for live plots.
+
+    Feed it the entries produced by get_gpu_stats() and read back a time range
+    as NumPy arrays ("time" as datetime64[s], one float/int array per metric).
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, retention=RETENTION):
+        self.chunk_size = chunk_size
+        self.retention = retention
+        self._chunks = {}  # gpu_index -> list of _Chunk, oldest first
+
+    def append(self, entry):
+        t = int((datetime.strptime(entry["timestamp"], TIME_FORMAT) - EPOCH).total_seconds())
+        values = {key: int(round(entry[key] * scale)) for key, scale in METRICS.items()}
+
+        chunks = self._chunks.setdefault(entry["gpu_index"], [])
+        if not chunks or chunks[-1].count >= self.chunk_size:
+            if chunks:
+                chunks[-1].seal()
+            chunks.append(_Chunk(t))
+        chunks[-1].append(t, values)
+
+        # Drop whole chunks that fell out of the retention window
+        while len(chunks) > 1 and chunks[0].end < t - self.retention:
+            chunks.pop(0)
+
+    def gpus(self):
+        return sorted(self._chunks)
+
+    def range(self, gpu_index, start=None, end=None):
+        """Decode samples with start <= time <= end (datetimes or None for open-ended)."""
+        lo = None if start is None else int((start - EPOCH).total_seconds())
+        hi = None if end is None else int((end - EPOCH).total_seconds())
+
+        parts = [chunk.decode() for chunk in self._chunks.get(gpu_index, [])
+                 if (lo is None or chunk.end >= lo) and (hi is None or chunk.start <= hi)]
+        if not parts:
+            data = {key: np.empty(0, dtype=np.int64) for key in ["time", *METRICS]}
+        else:
+            data = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+        mask = np.ones(len(data["time"]), dtype=bool)
+        if lo is not None:
+            mask &= data["time"] >= lo
+        if hi is not None:
+            mask &= data["time"] <= hi
+
+        result = {"time": data["time"][mask].astype("datetime64[s]")}
+        for key, scale in METRICS.items():
+            values = data[key][mask]
+            result[key] = values / scale if scale != 1 else values
+        return result
+
+    def last(self, gpu_index, seconds):
+        """Decode the most recent `seconds` of history for one GPU."""
+        chunks = self._chunks.get(gpu_index)
+        if not chunks:
+            return self.range(gpu_index)
+        return self.range(gpu_index, start=EPOCH + timedelta(seconds=chunks[-1].end - seconds))
+
+    def nbytes(self, gpu_index=None):
+        gpu_ids = self.gpus() if gpu_index is None else [gpu_index]
+        return sum(chunk.nbytes() for gpu_id in gpu_ids for chunk in self._chunks.get(gpu_id, []))
@@ -1,35 +1,48 @@
 import time
 import json
-import pynvml
+import argparse
+import os
 from datetime import datetime
 import smtplib
 from email.mime.text import MIMEText
 import matplotlib.pyplot as plt
 import sqlite3
+from adaptive_sampler import AdaptiveSampler
+from gpu_history import GPUHistory
+from replay import replay_polls
+from gpu_shm import LatestStatePublisher, SHM_NAME
+
+try:
+    import pynvml
+except ImportError:
+    pynvml = None  # Only needed for live polling, replay works without a GPU
 
 # CONFIGURATION
-INTERVAL = 5  # seconds
+INTERVAL = 5  # seconds, polling rate when ADAPTIVE_SAMPLING is off
 TEMP_THRESHOLD = 80  # Celsius
 LOG_FILE = "gpu_log.json"
 DB_FILE = "gpu_log.db"
 EMAIL_ALERT_ENABLED = False  # Set to True if you want email alerts
 PLOT_DELAY = 2
+ADAPTIVE_SAMPLING = True  # Poll every second, but only store samples that changed (plus a heartbeat)
+PLOT_WINDOW = 15 * 60  # seconds of history shown in the live plot
+SHM_ENABLED = True  # Publish the latest sample per GPU in shared memory for local readers
+DISPLAY = "verbose"  # "verbose" status blocks, "top" live table, or "log" one line per poll
 
 # EMAIL CONFIG
 EMAIL_SENDER = "your_email@gmail.com"
 EMAIL_RECEIVER = "your_email@gmail.com"
 EMAIL_PASSWORD = "your_app_password"  # App-specific password, not normal one
 
-# Initialize NVML
-pynvml.nvmlInit()
-
-# Data cache for live plotting
-gpu_data = {}
+# Compressed per-GPU history for live plotting
+gpu_history = GPUHistory()
 
 # Initialize SQLite DB and tables if they don't exist
 def init_db():
     conn = sqlite3.connect(DB_FILE)
     c = conn.cursor()
+    # WAL lets the dashboard and query API read while we write
+    c.execute("PRAGMA journal_mode=WAL")
     c.execute("""
         CREATE TABLE IF NOT EXISTS gpu_stats (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -40,9 +53,14 @@ def init_db():
             memory_total_MB INTEGER,
             temperature_C INTEGER,
             power_usage_W REAL,
-            fan_speed_percent INTEGER
+            fan_speed_percent INTEGER,
+            sample_interval_s REAL
         )
     """)
+    # Databases created before adaptive sampling lack the interval column
+    columns = [row[1] for row in c.execute("PRAGMA table_info(gpu_stats)")]
+    if "sample_interval_s" not in columns:
+        c.execute("ALTER TABLE gpu_stats ADD COLUMN sample_interval_s REAL")
     c.execute("""
         CREATE TABLE IF NOT EXISTS gpu_processes (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -52,6 +70,8 @@ def init_db():
             FOREIGN KEY (gpu_id) REFERENCES gpu_stats(id)
         )
     """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_gpu_stats_gpu_time ON gpu_stats (gpu_index, timestamp)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_gpu_processes_gpu_id ON gpu_processes (gpu_id)")
     conn.commit()
     conn.close()
 
@@ -64,8 +84,8 @@ def save_to_db(data):
         # Insert into gpu_stats
         c.execute("""
             INSERT INTO gpu_stats (gpu_index, timestamp, gpu_utilization, memory_used_MB, memory_total_MB,
-                                  temperature_C, power_usage_W, fan_speed_percent)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                                  temperature_C, power_usage_W, fan_speed_percent, sample_interval_s)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             entry["gpu_index"],
             entry["timestamp"],
@@ -74,7 +94,8 @@ def save_to_db(data):
             entry["memory_total_MB"],
             entry["temperature_C"],
             entry["power_usage_W"],
-            entry["fan_speed_percent"]
+            entry["fan_speed_percent"],
+            entry.get("sample_interval_s", INTERVAL)
         ))
         gpu_id = c.lastrowid
 
@@ -102,9 +123,9 @@ def send_email_alert(subject, body):
         with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
             server.login(EMAIL_SENDER, EMAIL_PASSWORD)
             server.send_message(msg)
-        print("Email alert sent!")
+        return "Email alert sent!"
     except Exception as e:
-        print("Email alert failed:", e)
+        return f"Email alert failed: {e}"
 
 def print_status(entry):
     print("=" * 60)
@@ -124,6 +145,23 @@ def print_status(entry):
         print("No active GPU processes.")
     print("=" * 60)
 
+def print_log_line(stats, alerted):
+    # One compact key=value line per poll, for journald and other line-based logs
+    fields = [f"time={stats[0]['timestamp'].replace(' ', 'T')}"] if stats else []
+    for entry in stats:
+        gpu = f"gpu{entry['gpu_index']}"
+        fields += [
+            f"{gpu}.util={entry['gpu_utilization']}",
+            f"{gpu}.mem={entry['memory_used_MB']}/{entry['memory_total_MB']}",
+            f"{gpu}.temp={entry['temperature_C']}",
+            f"{gpu}.power={entry['power_usage_W']:.1f}",
+            f"{gpu}.fan={entry['fan_speed_percent']}",
+            f"{gpu}.procs={len(entry.get('processes', []))}",
+        ]
+    if alerted:
+        fields.append("alert=" + ",".join(f"gpu{entry['gpu_index']}.temp" for entry in alerted))
+    print(" ".join(fields), flush=True)
+
 def get_gpu_stats():
     data = []
     device_count = pynvml.nvmlDeviceGetCount()
@@ -177,13 +215,15 @@ def save_to_json(data, filename=LOG_FILE):
 
 def update_plot():
     plt.clf()
-    num_gpus = len(gpu_data)
+    gpu_ids = gpu_history.gpus()
+    num_gpus = len(gpu_ids)
 
-    for idx, (gpu_id, data) in enumerate(gpu_data.items()):
+    for idx, gpu_id in enumerate(gpu_ids):
+        data = gpu_history.last(gpu_id, PLOT_WINDOW)
         times = data["time"]
-        temp = data["temp"]
-        util = data["util"]
-        mem = data["mem"]
+        temp = data["temperature_C"]
+        util = data["gpu_utilization"]
+        mem = data["memory_used_MB"]
 
         plt.subplot(num_gpus, 1, idx + 1)
         plt.plot(times, temp, label="Temp (°C)", color='r')
@@ -198,23 +238,111 @@ def update_plot():
 
     plt.pause(0.05)  # Allow plot to update
 
+def poll_nvml(sampler, wait=time.sleep):
+    # Initialize NVML and poll it forever, one list of entries per interval
+    pynvml.nvmlInit()
+    while True:
+        yield get_gpu_stats()
+        wait(sampler.interval if ADAPTIVE_SAMPLING else INTERVAL)
+
+def replay_log(path):
+    # argparse type for --replay: an existing gpu_log.json, or a gpu_log.db with a gpu_stats table
+    if not os.path.isfile(path):
+        raise argparse.ArgumentTypeError(f"no such log file: {path!r}")
+    if path.endswith(".db"):
+        try:
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                conn.execute("SELECT 1 FROM gpu_stats LIMIT 1")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            raise argparse.ArgumentTypeError(f"{path!r} is not a GPU log database ({e})")
+    return path
+
+def replay_speed(value):
+    # argparse type for --speed: 'max' (returned as None) or a positive factor
+    if value == "max":
+        return None
+    try:
+        speed = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'max', got {value!r}")
+    if not speed > 0:  # also rejects nan
+        raise argparse.ArgumentTypeError(f"speed must be greater than 0, got {value!r}")
+    return speed
+
 
 if __name__ == "__main__":
-    print("🟢 GPU Monitoring + Live Plotting started. Press Ctrl+C to stop.")
+    parser = argparse.ArgumentParser(description="GPU monitoring with live plotting, alerts and SQLite/JSON logging.")
+    parser.add_argument("--replay", metavar="LOG", type=replay_log,
+                        help="re-drive a recorded gpu_log.json or gpu_log.db instead of polling NVML")
+    parser.add_argument("--speed", type=replay_speed, default=1.0,
+                        help="replay speed: 1 for real time, N for N times faster, or 'max'")
+    parser.add_argument("--no-plot", action="store_true", help="disable the live plot")
+    parser.add_argument("--display", choices=["verbose", "top", "log"], default=DISPLAY,
+                        help="console output: status blocks, live table, or one line per poll")
+    args = parser.parse_args()
+    if args.display == "top":
+        # curses is missing from Windows CPython, so only the top display depends on it
+        try:
+            from gpu_top import GPUTop
+        except ImportError as e:
+            parser.error(f"--display top needs the curses module ({e}), try 'pip install windows-curses'")
+
+    sampler = AdaptiveSampler()
+    if args.replay:
+        # Keep replayed data away from the live log
+        LOG_FILE = "replay_gpu_log.json"
+        DB_FILE = "replay_gpu_log.db"
+        if os.path.abspath(args.replay) in (os.path.abspath(LOG_FILE), os.path.abspath(DB_FILE)):
+            parser.error("cannot replay the replay output onto itself")
+        # SQLite's WAL files go too, or the fresh database would pick up the old run's pages
+        for path in (LOG_FILE, DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        speed = args.speed
+        print(f"🟢 Replaying {args.replay} at {'max speed' if speed is None else f'{speed:g}x'}. Press Ctrl+C to stop.")
+    else:
+        if pynvml is None:
+            parser.error("pynvml is not installed, only --replay is available")
+        print("🟢 GPU Monitoring + Live Plotting started. Press Ctrl+C to stop.")
 
     init_db()  # Initialize database
-
-    plt.ion()
-    plt.figure(figsize=(10, 5))
+    publisher = None
+    if SHM_ENABLED:
+        try:
+            publisher = LatestStatePublisher(SHM_NAME + "_replay" if args.replay else SHM_NAME)
+        except RuntimeError as e:
+            parser.error(str(e))
+
+    if not args.no_plot:
+        plt.ion()
+        plt.figure(figsize=(10, 5))
+    top = GPUTop(gpu_history, TEMP_THRESHOLD) if args.display == "top" else None
+    # In top mode the waits between polls keep answering keys instead of sleeping blind
+    wait = top.wait if top else time.sleep
+    polls = replay_polls(args.replay, speed, wait) if args.replay else poll_nvml(sampler, wait)
     iteration_number = 0
+    samples = stored = alerts = 0
+    started = time.perf_counter()
     try:
-        while True:
-            stats = get_gpu_stats()
-            save_to_json(stats)
-            save_to_db(stats)  # Save into SQLite DB
-
+        for stats in polls:
+            if top and top.quit:
+                break  # q was pressed while waiting for this poll
+            to_save = sampler.filter(stats) if ADAPTIVE_SAMPLING else stats
+            if to_save:
+                save_to_json(to_save, LOG_FILE)
+                save_to_db(to_save)  # Save into SQLite DB
+            samples += len(stats)
+            stored += len(to_save)
+            if publisher:
+                publisher.publish(stats)
+
+            alerted = []
             for entry in stats:
-                print_status(entry)
+                if args.display == "verbose":
+                    print_status(entry)
 
                 # 🔥 TEMP ALERT CHECK
                 if entry["temperature_C"] >= TEMP_THRESHOLD:
@@ -224,44 +352,49 @@ if __name__ == "__main__":
                         f"Memory: {entry['memory_used_MB']}/{entry['memory_total_MB']} MB\n"
                         f"Time: {entry['timestamp']}"
                     )
-                    print("🚨 Temperature alert triggered!")
-                    if EMAIL_ALERT_ENABLED:
-                        send_email_alert(
+                    if args.display == "verbose":
+                        print("🚨 Temperature alert triggered!")
+                    alerted.append(entry)
+                    alerts += 1
+                    if EMAIL_ALERT_ENABLED and not args.replay:
+                        result = send_email_alert(
                             subject="🔥 GPU Temperature Alert",
                             body=warning_msg
                         )
+                        if top:
+                            top.notice = result  # curses owns the screen, show it under the table
+                        else:
+                            print(result)
+
+                # Append new sample (old chunks expire after the history's retention)
+                gpu_history.append(entry)
 
-                print_status(entry)
-                gpu_id = entry["gpu_index"]
-
-                # Initialize GPU data
-                if gpu_id not in gpu_data:
-                    gpu_data[gpu_id] = {
-                        "time": [],
-                        "temp": [],
-                        "util": [],
-                        "mem": []
-                    }
-
-                # Append new sample
-                timestamp = datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M:%S")
-                gpu_data[gpu_id]["time"].append(timestamp)
-                gpu_data[gpu_id]["temp"].append(entry["temperature_C"])
-                gpu_data[gpu_id]["util"].append(entry["gpu_utilization"])
-                gpu_data[gpu_id]["mem"].append(entry["memory_used_MB"])
-
-                # Keep only the last 20 samples
-                for key in ["time", "temp", "util", "mem"]:
-                    if len(gpu_data[gpu_id][key]) > 20:
-                        gpu_data[gpu_id][key].pop(0)
+            if top:
+                if not top.handle_keys():
+                    break
+                top.render(stats, alerted)
+            elif args.display == "log":
+                print_log_line(stats, alerted)
 
             iteration_number += 1
-            if iteration_number > 1:
+            if iteration_number > 1 and not args.no_plot:
                 update_plot()
 
-            time.sleep(INTERVAL)  # Wait only after first plot
-
     except KeyboardInterrupt:
+        if top:
+            top.close()
+            top = None
         print("\nMonitoring stopped by user.")
+    finally:
+        if top:
+            top.close()
+        if publisher:
+            publisher.close()
+
+    if args.replay:
+        elapsed = time.perf_counter() - started
+        print(f"Replayed {samples} samples in {iteration_number} polls in {elapsed:.2f} s "
+              f"({samples / max(elapsed, 1e-9):.0f} samples/s): {stored} rows stored, {alerts} alerts.")
+    if not args.no_plot:
         plt.ioff()
         plt.show()
@@ -0,0 +1,233 @@
+import os
+import time
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+# CONFIGURATION
+SHM_NAME = "ca_gpu_latest"
+MAX_GPUS = 16
+MAGIC = 0x43414750  # "CAGP"
+LAYOUT_VERSION = 2
+READ_TIMEOUT = 0.5  # seconds read() waits for a consistent snapshot before giving up
+
+# Fixed layout: a header followed by one record per GPU slot, indexed by gpu_index
+HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"),
+    ("layout_version", "<u4"),
+    ("max_gpus", "<u4"),
+    ("num_gpus", "<u4"),
+    ("seq", "<u8"),  # seqlock: odd while the writer is updating the records
+    ("writer_pid", "<u4"),  # the block is abandoned once this process is gone
+    ("reserved", "<u4"),
+])
+RECORD_DTYPE = np.dtype([
+    ("valid", "u1"),
+    ("gpu_index", "<i4"),
+    ("timestamp", "<M8[s]"),
+    ("gpu_utilization", "<i4"),
+    ("memory_used_MB", "<i4"),
+    ("memory_total_MB", "<i4"),
+    ("temperature_C", "<i4"),
+    ("power_usage_W", "<f8"),
+    ("fan_speed_percent", "<i4"),
+    ("num_processes", "<i4"),
+], align=True)
+
+
+def _views(buf, max_gpus):
+    header = np.ndarray((), dtype=HEADER_DTYPE, buffer=buf)
+    records = np.ndarray((max_gpus,), dtype=RECORD_DTYPE, buffer=buf, offset=HEADER_DTYPE.itemsize)
+    return header, records
+
+
+def _attach(name):
+    # Attach without tracking: the resource tracker would otherwise unlink the block when we exit
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers attached segments too, but only POSIX has a resource tracker
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _pid_alive(pid):
+    if os.name == "posix":
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass  # exists, owned by another user
+        return True
+
+    # On Windows os.kill() would terminate the process, so ask for its exit code instead
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+    if not handle:
+        return kernel32.GetLastError() == 5  # ERROR_ACCESS_DENIED: exists, but not ours
+    exit_code = ctypes.c_ulong()
+    try:
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True
+        return exit_code.value == 259  # STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _writer_alive(header):
+    return (header["magic"] == MAGIC and header["layout_version"] == LAYOUT_VERSION
+            and _pid_alive(int(header["writer_pid"])))
+
+
+def _retire(name):
+    """Unlink an existing block, unless the process that wrote it is still running."""
+    old = shared_memory.SharedMemory(name=name)
+    alive = False
+    if old.size >= HEADER_DTYPE.itemsize:
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=old.buf)
+        alive = _writer_alive(header)
+        if not alive:
+            header["magic"] = 0  # readers still mapped to it re-attach to the new block
+        del header
+    old.close()
+    if alive:
+        if os.name == "posix":
+            resource_tracker.unregister(old._name, "shared_memory")  # ours to leave alone, not to unlink at exit
+        raise RuntimeError(f"another collector is publishing to shared memory block '{name}'")
+    old.unlink()
+
+
+class LatestStatePublisher:
+    """Single writer: the collector publishes every poll into the shared block."""
+
+    def __init__(self, name=SHM_NAME, max_gpus=MAX_GPUS):
+        self.max_gpus = max_gpus
+        size = HEADER_DTYPE.itemsize + RECORD_DTYPE.itemsize * max_gpus
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a collector that crashed: take it over once its process is gone
+            _retire(name)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self.header, self.records = _views(self.shm.buf, max_gpus)
+        self.records[:] = np.zeros(max_gpus, dtype=RECORD_DTYPE)
+        self.header["seq"] = 0
+        self.header["max_gpus"] = max_gpus
+        self.header["num_gpus"] = 0
+        self.header["writer_pid"] = os.getpid()
+        self.header["layout_version"] = LAYOUT_VERSION
+        self.header["magic"] = MAGIC  # written last: readers check it before trusting the rest
+
+    def publish(self, stats):
+        self.header["seq"] += 1  # odd: update in progress
+        try:
+            for entry in stats:
+                i = entry["gpu_index"]
+                if i >= self.max_gpus:
+                    continue
+                rec = self.records[i]
+                rec["gpu_index"] = i
+                rec["timestamp"] = np.datetime64(entry["timestamp"].replace(" ", "T"), "s")
+                rec["gpu_utilization"] = entry["gpu_utilization"]
+                rec["memory_used_MB"] = entry["memory_used_MB"]
+                rec["memory_total_MB"] = entry["memory_total_MB"]
+                rec["temperature_C"] = entry["temperature_C"]
+                rec["power_usage_W"] = entry["power_usage_W"]
+                rec["fan_speed_percent"] = entry["fan_speed_percent"]
+                rec["num_processes"] = len(entry.get("processes", []))
+                rec["valid"] = 1
+                self.header["num_gpus"] = max(int(self.header["num_gpus"]), i + 1)
+        finally:
+            self.header["seq"] += 1  # even: records are consistent again, even if an entry was bad
+
+    def close(self):
+        self.header["magic"] = 0  # tell attached readers this block is gone before unlinking it
+        del self.header, self.records  # release the exported buffer before closing
+        self.shm.close()
+        self.shm.unlink()
+
+
+class LatestStateReader:
+    """
+    Any number of readers attach to the block without locking the writer.
+
+    `records` is a zero-copy structured view that always shows the latest values but may be
+    caught mid-update; `read()` copies a consistent snapshot using the seqlock counter.
+    Once `closed()` is true the collector stopped, crashed or was replaced, and readers should
+    attach again.
+    """
+
+    def __init__(self, name=SHM_NAME):
+        self.shm = _attach(name)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        ready = _writer_alive(header)
+        max_gpus = int(header["max_gpus"])
+        del header
+        if not ready:
+            # Closed, abandoned by a crashed collector, not initialised yet, or not ours
+            self.shm.close()
+            raise ValueError(f"shared memory block '{name}' does not hold GPU state (layout {LAYOUT_VERSION})")
+        self.header, self.records = _views(self.shm.buf, max_gpus)
+        self._snapshot = np.empty_like(self.records)
+
+        # Plain (non-structured) views keep the seqlock loop to a couple of memcpy-sized operations
+        self._seq = np.ndarray((), dtype="<u8", buffer=self.shm.buf, offset=HEADER_DTYPE.fields["seq"][1])
+        self._num_gpus = np.ndarray((), dtype="<u4", buffer=self.shm.buf, offset=HEADER_DTYPE.fields["num_gpus"][1])
+        self._copy = None  # (num_gpus, out, dst, src, result) of the last read()
+
+    def closed(self):
+        # A killed collector never clears magic, and the resource tracker may have unlinked
+        # its block already, so also check that the writer process still exists
+        return not _writer_alive(self.header)
+
+    def version(self):
+        return int(self._seq)
+
+    def read(self, out=None, timeout=READ_TIMEOUT):
+        """
+        Return a consistent copy of the GPU records (reusing `out` or an internal buffer).
+        Raises TimeoutError if the writer stays mid-update for `timeout` seconds, e.g. because
+        it was killed while publishing.
+        """
+        out = self._snapshot if out is None else out
+        deadline = None
+        while True:
+            before = self._seq.item()
+            if not before & 1:
+                num_gpus = self._num_gpus.item()
+                copy = self._copy
+                if copy is None or copy[0] != num_gpus or copy[1] is not out:
+                    copy = self._copy = self._copy_views(num_gpus, out)
+                copy[2][:] = copy[3]
+                if self._seq.item() == before:
+                    return copy[4]
+            # Contended: yield to the writer and stop waiting eventually
+            if deadline is None:
+                deadline = time.monotonic() + timeout
+            elif time.monotonic() > deadline:
+                raise TimeoutError(f"shared GPU state stayed mid-update for {timeout} s (version {before})")
+            time.sleep(0)
+
+    def _copy_views(self, num_gpus, out):
+        # Byte views of the used slots only, kept until num_gpus or `out` changes:
+        # assigning between memoryviews is a bare memcpy, without numpy's per-call overhead
+        self._release_copy()
+        size = num_gpus * RECORD_DTYPE.itemsize
+        src = self.shm.buf[HEADER_DTYPE.itemsize:HEADER_DTYPE.itemsize + size]
+        dst = memoryview(out.view(np.uint8))[:size]
+        return num_gpus, out, dst, src, out[:num_gpus]
+
+    def _release_copy(self):
+        if self._copy is not None:
+            self._copy[2].release()
+            self._copy[3].release()
+            self._copy = None
+
+    def close(self):
+        self._release_copy()
+        del self.header, self.records, self._seq, self._num_gpus
+        self.shm.close()
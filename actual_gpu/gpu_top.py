@@ -0,0 +1,247 @@
+import curses
+import locale
+import time
+from gpu_history import GPUHistory
+
+# CONFIGURATION
+REFRESH = 0.5  # seconds between shared-memory checks in the standalone viewer
+KEY_POLL = 0.05  # seconds, how often keys are checked while waiting for the next sample
+TEMP_THRESHOLD = 80  # Celsius, highlighted in the table
+SPARK_WIDTH = 30  # utilization samples shown per GPU
+SPARK_SECONDS = 15 * 60  # history window the sparkline samples come from
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# Sort keys: key press -> (label, sort key, descending)
+SORT_KEYS = {
+    ord("g"): ("gpu", lambda e: e["gpu_index"], False),
+    ord("u"): ("util", lambda e: e["gpu_utilization"], True),
+    ord("t"): ("temp", lambda e: e["temperature_C"], True),
+    ord("m"): ("mem", lambda e: e["memory_used_MB"], True),
+}
+
+# Table columns: (title, width)
+COLUMNS = [
+    ("GPU", 3),
+    ("UTIL", 5),
+    ("MEMORY", 15),
+    ("TEMP", 5),
+    ("POWER", 8),
+    ("FAN", 4),
+    ("PROCS", 5),
+    ("UTIL HISTORY", SPARK_WIDTH),
+]
+
+
+def sparkline(values, width=SPARK_WIDTH, top=100):
+    values = values[-width:]
+    levels = len(SPARK_CHARS)
+    return "".join(SPARK_CHARS[min(levels - 1, int(v * levels / (top + 1)))] for v in values)
+
+
+def format_cells(entry, history):
+    processes = entry.get("num_processes", len(entry.get("processes", [])))
+    util_history = history.last(entry["gpu_index"], SPARK_SECONDS)["gpu_utilization"]
+    return [
+        str(entry["gpu_index"]),
+        f"{entry['gpu_utilization']}%",
+        f"{entry['memory_used_MB']}/{entry['memory_total_MB']} MB",
+        f"{entry['temperature_C']}°C",
+        f"{entry['power_usage_W']:.1f} W",
+        f"{entry['fan_speed_percent']}%",
+        str(processes),
+        sparkline(util_history),
+    ]
+
+
+class GPUTop:
+    """
+    Full-screen table of the latest sample per GPU. Every cell remembers what it last showed
+    and is only rewritten when its text changes, so a quiet GPU costs no terminal output.
+    Keys: g/u/t/m sort by GPU, utilization, temperature, memory; q quits.
+    """
+
+    def __init__(self, history, temp_threshold=TEMP_THRESHOLD):
+        self.history = history
+        self.temp_threshold = temp_threshold
+        self.sort = ord("g")
+        self.alert = ""
+        self.notice = ""  # set by the caller, e.g. the outcome of an email alert
+        self.dirty = False  # a key press changed the layout since the last render
+        self.quit = False  # q was pressed during wait()
+        self._stats = []  # last rendered poll, redrawn when a key changes the layout
+        self._cells = {}  # (y, x) -> (text, attr) currently on screen
+        self._rows = 0
+
+        locale.setlocale(locale.LC_ALL, "")  # needed for the sparkline and °C characters
+        self.stdscr = curses.initscr()
+        curses.noecho()
+        curses.cbreak()
+        self.stdscr.keypad(True)
+        self.stdscr.nodelay(True)
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+
+    def close(self):
+        self.stdscr.keypad(False)
+        curses.nocbreak()
+        curses.echo()
+        curses.endwin()
+
+    def handle_keys(self):
+        """Process pending key presses; return False once the user asked to quit."""
+        while True:
+            key = self.stdscr.getch()
+            if key == -1:
+                return True
+            if key in (ord("q"), ord("Q")):
+                return False
+            if key in SORT_KEYS:
+                self.sort = key
+                self.dirty = True
+            elif key == curses.KEY_RESIZE:
+                self._cells.clear()
+                self.stdscr.clear()
+                self.dirty = True
+
+    def wait(self, seconds):
+        """
+        Sleep for `seconds` while still answering keys: a new sort order is drawn right away,
+        and q ends the wait early and sets `quit`.
+        """
+        deadline = time.monotonic() + seconds
+        while True:
+            if not self.handle_keys():
+                self.quit = True
+                return
+            if self.dirty:
+                self.render(self._stats)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(KEY_POLL, remaining))
+
+    def _put(self, y, x, text, attr=curses.A_NORMAL):
+        if self._cells.get((y, x)) == (text, attr):
+            return
+        self._cells[(y, x)] = (text, attr)
+        try:
+            self.stdscr.addstr(y, x, text, attr)
+        except curses.error:
+            pass  # cell falls outside a small terminal
+
+    def render(self, stats, alerts=()):
+        if alerts:
+            gpus = ", ".join(str(e["gpu_index"]) for e in alerts)
+            self.alert = f"🚨 [{alerts[0]['timestamp']}] temperature alert on GPU {gpus}"
+
+        self._stats = stats
+        label, key, descending = SORT_KEYS[self.sort]
+        rows = sorted(stats, key=key, reverse=descending)
+        table_width = sum(width + 1 for _, width in COLUMNS)
+        timestamp = stats[0]["timestamp"] if stats else ""
+
+        self._put(0, 0, f"gpu top  {timestamp}  sort: {label}  (g/u/t/m to sort, q to quit)".ljust(table_width))
+        x = 0
+        for title, width in COLUMNS:
+            self._put(1, x, title.rjust(width) if width < SPARK_WIDTH else title.ljust(width), curses.A_REVERSE)
+            x += width + 1
+
+        for row, entry in enumerate(rows):
+            y = 2 + row
+            x = 0
+            for (title, width), text in zip(COLUMNS, format_cells(entry, self.history)):
+                attr = curses.A_NORMAL
+                if title == "TEMP" and entry["temperature_C"] >= self.temp_threshold:
+                    attr = curses.A_BOLD | curses.A_STANDOUT
+                self._put(y, x, text.rjust(width) if width < SPARK_WIDTH else text.ljust(width), attr)
+                x += width + 1
+
+        # Blank out rows (and the old alert line) left over from a longer table
+        for y in range(2 + len(rows), 3 + self._rows):
+            self._put(y, 0, " " * table_width)
+        self._rows = len(rows)
+        status = "  ".join(text for text in (self.alert, self.notice) if text)
+        self._put(3 + len(rows), 0, status.ljust(table_width))
+
+        self.dirty = False
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+
+def record_to_entry(record):
+    # Shared-memory records carry a process count instead of the process list
+    return {
+        "gpu_index": int(record["gpu_index"]),
+        "timestamp": str(record["timestamp"]).replace("T", " "),
+        "gpu_utilization": int(record["gpu_utilization"]),
+        "memory_used_MB": int(record["memory_used_MB"]),
+        "memory_total_MB": int(record["memory_total_MB"]),
+        "temperature_C": int(record["temperature_C"]),
+        "power_usage_W": float(record["power_usage_W"]),
+        "fan_speed_percent": int(record["fan_speed_percent"]),
+        "num_processes": int(record["num_processes"]),
+    }
+
+
+def attach(name):
+    from gpu_shm import LatestStateReader
+    try:
+        return LatestStateReader(name)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+if __name__ == "__main__":
+    # Standalone viewer: follows the running collector through its shared-memory block
+    from gpu_shm import SHM_NAME
+
+    reader = attach(SHM_NAME)
+    if reader is None:
+        print(f"❌ Shared memory block '{SHM_NAME}' not found. Start gpu_log.py first.")
+        raise SystemExit(1)
+
+    history = GPUHistory()
+    top = GPUTop(history)
+    seen = None
+    stats = []
+    try:
+        while not top.quit and top.handle_keys():
+            if reader is None or reader.closed():
+                # The collector stopped or restarted: follow it to its new block
+                if reader is not None:
+                    reader.close()
+                    top.alert = "⏸ collector stopped, waiting for it to restart"
+                    top.render(stats)
+                reader = attach(SHM_NAME)
+                seen = None
+                if reader is None:
+                    top.wait(REFRESH)
+                    continue
+                top.alert = ""
+
+            version = reader.version()
+            if version != seen:
+                try:
+                    snapshot = reader.read()
+                except TimeoutError:
+                    # The writer was killed mid-update: back off, then attach to whatever replaces it
+                    reader.close()
+                    reader = None
+                    top.alert = "⏸ collector stopped, waiting for it to restart"
+                    top.render(stats)
+                    top.wait(REFRESH)
+                    continue
+                seen = version
+                stats = [record_to_entry(r) for r in snapshot if r["valid"]]
+                for entry in stats:
+                    history.append(entry)
+                top.render(stats)
+            top.wait(REFRESH)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        top.close()
+        if reader is not None:
+            reader.close()
@@ -0,0 +1,366 @@
+import csv
+import io
+import json
+import os
+import queue
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from adaptive_sampler import MAX_GAP, POLL_INTERVAL
+
+# CONFIGURATION
+DB_FILE = "gpu_log.db"
+HOST = "0.0.0.0"
+PORT = 8060
+POOL_SIZE = 4  # read-only SQLite connections shared by the request threads
+CACHE_ENTRIES = 128  # responses kept in the LRU cache
+CACHE_MAX_BYTES = 1024 * 1024  # larger responses are streamed but not cached
+FETCH_SIZE = 500  # rows fetched from SQLite per streamed chunk
+DEFAULT_INTERVAL = 5.0  # seconds the last row of a GPU accounts for when sample_interval_s is missing
+SPAN_SLACK = 5  # seconds a heartbeat row may land late: poll time plus 1 s timestamp rounding
+# The collector stores a row at least this often, longer gaps are outages
+MAX_SPAN = float(MAX_GAP + POLL_INTERVAL + SPAN_SLACK)
+
+METRICS = ["gpu_utilization", "memory_used_MB", "memory_total_MB",
+           "temperature_C", "power_usage_W", "fan_speed_percent"]
+AGGREGATIONS = {"avg", "min", "max"}
+
+
+class BadRequest(Exception):
+    pass
+
+
+class ConnectionPool:
+    """A fixed set of read-only connections, so readers never contend with the collector's writes."""
+
+    def __init__(self, db_file=DB_FILE, size=POOL_SIZE):
+        self._pool = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True, check_same_thread=False)
+            self._pool.put(conn)
+
+        # Older databases (and the mock one) have no sample_interval_s column
+        with self.connection() as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(gpu_stats)")]
+        self.tail_span = (f"COALESCE(sample_interval_s, {DEFAULT_INTERVAL})"
+                          if "sample_interval_s" in columns else str(DEFAULT_INTERVAL))
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def high_water_mark(self):
+        # Rows are only ever appended, so the last id changes exactly when the writer commits
+        with self.connection() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM gpu_stats").fetchone()[0]
+
+
+class ResponseCache:
+    """LRU of encoded responses, each tagged with the high-water mark it was computed at."""
+
+    def __init__(self, size=CACHE_ENTRIES):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, hwm):
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or cached[0] != hwm:
+                return None
+            self._entries.move_to_end(key)
+            return cached[1]
+
+    def put(self, key, hwm, body):
+        with self._lock:
+            self._entries[key] = (hwm, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+# --- QUERIES ---
+def _param(params, name, default=None, cast=str):
+    if name not in params:
+        return default
+    try:
+        return cast(params[name][0])
+    except ValueError:
+        raise BadRequest(f"invalid value for '{name}': {params[name][0]}")
+
+
+def _time_filter(params):
+    # Timestamps are stored as "%Y-%m-%d %H:%M:%S", so string comparison orders them correctly
+    clauses, args = [], []
+    gpu = _param(params, "gpu", cast=int)
+    if gpu is not None:
+        clauses.append("gpu_index = ?")
+        args.append(gpu)
+    start = _param(params, "start")
+    if start is not None:
+        clauses.append("timestamp >= ?")
+        args.append(start)
+    end = _param(params, "end")
+    if end is not None:
+        clauses.append("timestamp <= ?")
+        args.append(end)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+
+def _spanned_stats(pool, params):
+    """
+    gpu_stats rows that hold a value inside the requested range, with the interval it holds:
+    "t0" to "t1" (unix seconds) runs from the row's timestamp (or the range start) until the
+    next stored row of the same GPU, and "span" is its length. The last row of a GPU falls
+    back to its polling interval.
+    """
+    epoch = "CAST(strftime('%s', timestamp) AS REAL)"
+    next_row = "LEAD(timestamp) OVER (PARTITION BY gpu_index ORDER BY id)"
+    span = f"MIN({MAX_SPAN}, COALESCE(CAST(strftime('%s', {next_row}) AS REAL) - {epoch}, {pool.tail_span}))"
+
+    # The GPU filter and a widened start filter can go inside the window without changing any
+    # row's successor; the end filter must stay outside so the last row in range still sees its next row.
+    inner, inner_args = [], []
+    outer, outer_args = [], []
+    t0, t0_args = "t0", []
+    gpu = _param(params, "gpu", cast=int)
+    if gpu is not None:
+        inner.append("gpu_index = ?")
+        inner_args.append(gpu)
+    start = _param(params, "start")
+    if start is not None:
+        # A row from up to MAX_SPAN before the start can still hold its value into the range
+        inner.append("timestamp >= datetime(?, ?)")
+        inner_args += [start, f"-{MAX_SPAN:g} seconds"]
+        outer.append("t1 > CAST(strftime('%s', ?) AS REAL)")
+        outer_args.append(start)
+        t0 = "MAX(t0, CAST(strftime('%s', ?) AS REAL))"
+        t0_args.append(start)
+    end = _param(params, "end")
+    if end is not None:
+        outer.append("timestamp <= ?")
+        outer_args.append(end)
+
+    sql = f"""
+        SELECT *, t1 - t0 AS span FROM (
+            SELECT id, gpu_index, timestamp, {", ".join(METRICS)}, {t0} AS t0, t1 FROM (
+                SELECT *, {epoch} AS t0, {epoch} + {span} AS t1
+                FROM gpu_stats{(" WHERE " + " AND ".join(inner)) if inner else ""}
+            ){(" WHERE " + " AND ".join(outer)) if outer else ""}
+        )
+    """
+    # Placeholders are numbered in the order they appear in the SQL text
+    return sql, t0_args + inner_args + outer_args
+
+
+def query_latest(pool, params):
+    sql = f"""
+        SELECT s.gpu_index, s.timestamp, {", ".join("s." + m for m in METRICS)}
+        FROM gpu_stats s
+        JOIN (SELECT gpu_index, MAX(id) AS id FROM gpu_stats GROUP BY gpu_index) latest ON s.id = latest.id
+        ORDER BY s.gpu_index
+    """
+    return sql, []
+
+
+def query_range(pool, params):
+    step = _param(params, "step", cast=int)
+    if step is None:
+        where, args = _time_filter(params)
+        sql = f"SELECT gpu_index, timestamp, {', '.join(METRICS)} FROM gpu_stats{where} ORDER BY id"
+        return sql, args
+
+    agg = _param(params, "agg", "avg")
+    if step <= 0:
+        raise BadRequest("'step' must be a positive number of seconds")
+    if agg not in AGGREGATIONS:
+        raise BadRequest(f"'agg' must be one of {sorted(AGGREGATIONS)}")
+
+    # A row's value holds for its whole span, which can cover several buckets (a 60 s heartbeat
+    # row with step=10 fills six), so split every span into one piece per bucket it overlaps.
+    # Averages are weighted by each piece's overlap, so adaptive sampling doesn't skew them.
+    # Buckets only come back empty during outages, where no row was stored for MAX_SPAN.
+    overlap = f"(MIN(t1, bucket + {step}) - MAX(t0, bucket))"
+    if agg == "avg":
+        columns = [f"SUM({m} * {overlap}) / CAST(SUM({overlap}) AS REAL) AS {m}" for m in METRICS]
+    else:
+        columns = [f"{agg.upper()}({m}) AS {m}" for m in METRICS]
+    stats, args = _spanned_stats(pool, params)
+    values = ", ".join(METRICS)
+    end = _param(params, "end")
+    clip = ""
+    if end is not None:
+        clip = " WHERE bucket <= CAST(strftime('%s', ?) AS INTEGER)"
+        args.append(end)
+    sql = f"""
+        WITH RECURSIVE pieces AS (
+            SELECT gpu_index, {values}, t0, t1, CAST(t0 AS INTEGER) / {step} * {step} AS bucket FROM ({stats})
+            UNION ALL
+            SELECT gpu_index, {values}, t0, t1, bucket + {step} FROM pieces WHERE bucket + {step} < t1
+        )
+        SELECT gpu_index, datetime(bucket, 'unixepoch') AS timestamp, {", ".join(columns)}
+        FROM pieces{clip}
+        GROUP BY gpu_index, bucket
+        ORDER BY bucket, gpu_index
+    """
+    return sql, args
+
+
+def query_top_processes(pool, params):
+    n = _param(params, "n", 10, cast=int)
+    if n <= 0:
+        raise BadRequest("'n' must be a positive number of processes")
+    stats, args = _spanned_stats(pool, params)
+    sql = f"""
+        SELECT p.pid, p.name, s.gpu_index, SUM(s.span) AS gpu_seconds
+        FROM gpu_processes p JOIN ({stats}) s ON p.gpu_id = s.id
+        GROUP BY p.pid, p.name, s.gpu_index
+        ORDER BY gpu_seconds DESC
+        LIMIT ?
+    """
+    return sql, args + [n]
+
+
+ROUTES = {
+    "/latest": query_latest,
+    "/range": query_range,
+    "/top-processes": query_top_processes,
+}
+
+
+# --- ENCODING ---
+def encode_rows(cursor, fmt):
+    """Yield the response body in chunks, FETCH_SIZE rows at a time."""
+    columns = [d[0] for d in cursor.description]
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(columns)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            writer.writerows(rows)
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode()
+    else:
+        yield b"["
+        first = True
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            parts = [json.dumps(dict(zip(columns, row))) for row in rows]
+            yield ((b"" if first else b",") + ",".join(parts).encode())
+            first = False
+        yield b"]"
+
+
+# --- SERVER ---
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # needed for chunked responses
+    pool = None
+    cache = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path)
+        if route is None:
+            return self._send_error(404, f"unknown endpoint {url.path}")
+        params = parse_qs(url.query)
+        fmt = _param(params, "format", "json")
+        if fmt not in ("json", "csv"):
+            return self._send_error(400, "'format' must be json or csv")
+
+        try:
+            hwm = self.pool.high_water_mark()
+            sql, args = route(self.pool, params)
+        except BadRequest as e:
+            return self._send_error(400, str(e))
+        except sqlite3.Error as e:
+            return self._send_error(503, f"database unavailable: {e}")
+
+        key = (url.path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        etag = f'"{hwm}-{zlib.crc32(repr(key).encode()):08x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        content_type = "text/csv" if fmt == "csv" else "application/json"
+        body = self.cache.get(key, hwm)
+        if body is not None:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        with self.pool.connection() as conn:
+            try:
+                cursor = conn.execute(sql, args)
+            except sqlite3.Error as e:
+                return self._send_error(503, f"database unavailable: {e}")
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("ETag", etag)
+            self.end_headers()
+
+            # Stream the body, keeping a copy only while it is small enough to cache
+            cached = []
+            cached_size = 0
+            for chunk in encode_rows(cursor, fmt):
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                if cached is not None:
+                    cached.append(chunk)
+                    cached_size += len(chunk)
+                    if cached_size > CACHE_MAX_BYTES:
+                        cached = None
+            self.wfile.write(b"0\r\n\r\n")
+            cursor.close()
+
+        if cached is not None:
+            self.cache.put(key, hwm, b"".join(cached))
+
+    def _send_error(self, status, message):
+        body = json.dumps({"error": message}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(db_file=DB_FILE, host=HOST, port=PORT):
+    # A subclass per server, so several servers in one process don't share a pool or cache
+    handler = type("QueryHandler", (QueryHandler,), {"pool": ConnectionPool(db_file), "cache": ResponseCache()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    if not os.path.exists(DB_FILE):
+        print(f"❌ {DB_FILE} not found. Start the collector first.")
+    else:
+        server = make_server()
+        print(f"🟢 GPU query API serving {DB_FILE} on http://{HOST}:{PORT}. Press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nQuery API stopped by user.")
+            server.server_close()
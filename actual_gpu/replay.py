@@ -0,0 +1,77 @@
+import json
+import sqlite3
+import time
+from datetime import datetime
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def load_json_log(path):
+    """Yield the entries of a gpu_log.json file (one JSON object per line)."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_db_log(path):
+    """Yield the entries of a gpu_log.db file in insertion order, with their processes."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        proc_columns = [row[1] for row in conn.execute("PRAGMA table_info(gpu_processes)")]
+        proc_fields = [c for c in ("pid", "name", "used_memory_MB") if c in proc_columns]
+        stats = conn.execute("SELECT * FROM gpu_stats ORDER BY id")
+        procs = conn.execute(f"SELECT gpu_id, {', '.join(proc_fields)} FROM gpu_processes ORDER BY gpu_id, id")
+
+        # Both cursors are ordered by stats id, so walk them side by side instead of querying per row
+        proc = procs.fetchone()
+        for row in stats:
+            entry = {key: row[key] for key in row.keys() if key not in ("id", "sample_interval_s")}
+            entry["processes"] = []
+            while proc is not None and proc["gpu_id"] <= row["id"]:
+                if proc["gpu_id"] == row["id"]:
+                    entry["processes"].append({key: proc[key] for key in proc_fields})
+                proc = procs.fetchone()
+            yield entry
+    finally:
+        conn.close()
+
+
+def load_log(path):
+    return load_db_log(path) if path.endswith(".db") else load_json_log(path)
+
+
+def group_polls(path):
+    """Yield (time, entries) for each poll of the recorded log: consecutive entries sharing a timestamp."""
+    poll = []
+    poll_time = None
+    for entry in load_log(path):
+        t = datetime.strptime(entry["timestamp"], TIME_FORMAT)
+        if poll and t != poll_time:
+            yield poll_time, poll
+            poll = []
+        poll.append(entry)
+        poll_time = t
+    if poll:
+        yield poll_time, poll
+
+
+def replay_polls(path, speed=1.0, wait=time.sleep):
+    """
+    Yield the recorded log one poll at a time (all GPUs sharing a timestamp), keeping the
+    recorded timestamps. Each poll is released when the replay clock reaches its recorded
+    offset divided by `speed`, so time the consumer spends on a poll counts towards the gap;
+    speed=None replays as fast as the pipeline can consume it. `wait` does the sleeping, so an
+    interactive display can keep handling keys in the meantime.
+    """
+    first_time = started = None
+    for t, poll in group_polls(path):
+        if speed is not None:
+            if first_time is None:
+                first_time, started = t, time.monotonic()
+            # A clock that stepped backwards in the recording just releases the poll right away
+            delay = started + (t - first_time).total_seconds() / speed - time.monotonic()
+            if delay > 0:
+                wait(delay)
+        yield poll
@@ -6,8 +6,11 @@ from datetime import datetime
 import sqlite3
 import os
 from email.mime.text import MIMEText
-from collections import defaultdict
 import matplotlib.pyplot as plt
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "actual_gpu"))
+from gpu_history import GPUHistory
 
 # --- CONFIGURATION ---
 NUM_GPUS = random.randint(1, 4)
@@ -22,9 +25,9 @@ EMAIL_RECEIVER = "your_email@gmail.com"
 EMAIL_PASSWORD = "your_app_password"  # Use app-specific password
 
 # Plotting config
-MAX_POINTS = 20
+PLOT_WINDOW = 15 * 60  # seconds of history shown in the live plot
 PLOT_DELAY = 2  # how many intervals before plotting starts
-gpu_plot_data = defaultdict(lambda: {"time": [], "temp": [], "util": [], "mem": []})
+gpu_history = GPUHistory()
 
 # Initialize matplotlib
 plt.ion()
@@ -174,12 +177,13 @@ def print_status(entry):
 
 def update_plot():
     plt.clf()
-    for gpu_id, data in sorted(gpu_plot_data.items()):
+    for gpu_id in gpu_history.gpus():
+        data = gpu_history.last(gpu_id, PLOT_WINDOW)
         times = data["time"]
         plt.subplot(NUM_GPUS, 1, gpu_id + 1)
-        plt.plot(times, data["temp"], label="Temp (°C)", color="red")
-        plt.plot(times, data["util"], label="Util (%)", color="blue")
-        plt.plot(times, data["mem"], label="Mem (MB)", color="green")
+        plt.plot(times, data["temperature_C"], label="Temp (°C)", color="red")
+        plt.plot(times, data["gpu_utilization"], label="Util (%)", color="blue")
+        plt.plot(times, data["memory_used_MB"], label="Mem (MB)", color="green")
         plt.title(f"GPU {gpu_id}")
         plt.ylabel("Value")
         plt.xticks(rotation=45)
@@ -206,17 +210,7 @@ if __name__ == "__main__":
                 print_status(entry)
 
                 # Update plot data
-                gpu_id = entry["gpu_index"]
-                ts = datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M:%S")
-                gpu_plot_data[gpu_id]["time"].append(ts)
-                gpu_plot_data[gpu_id]["temp"].append(entry["temperature_C"])
-                gpu_plot_data[gpu_id]["util"].append(entry["gpu_utilization"])
-                gpu_plot_data[gpu_id]["mem"].append(entry["memory_used_MB"])
-
-                # Trim
-                for key in ["time", "temp", "util", "mem"]:
-                    if len(gpu_plot_data[gpu_id][key]) > MAX_POINTS:
-                        gpu_plot_data[gpu_id][key].pop(0)
+                gpu_history.append(entry)
 
             cycle += 1
             if cycle >= PLOT_DELAY: